@@ -1,10 +1,28 @@
+import os
+import threading
+from importlib import import_module
 from flask import Flask
 
-def create_app():
+def create_app(warm_cache=True):
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'your-secret-key'  
+    # Comma-separated genres to pre-fetch in the background; empty disables warm-up
+    app.config['WARM_GENRES'] = os.getenv('WARM_GENRES', '')
+    app.config['WARM_INTERVAL'] = int(os.getenv('WARM_INTERVAL', '600'))
 
     from .routes import bp as main_bp
     app.register_blueprint(main_bp)
 
+    if warm_cache:
+        # Request handlers import spotipy lazily; load it now, off the boot and request paths
+        threading.Thread(target=import_module, args=('spotipy.oauth2',), name='spotipy-preload', daemon=True).start()
+
+        genres = [g.strip() for g in app.config['WARM_GENRES'].split(',') if g.strip()]
+        if genres:
+            from .warmup import CacheWarmer
+            warmer = CacheWarmer(genres, app.config['WARM_INTERVAL'])
+            app.extensions['trending_cache_warmer'] = warmer
+            # Started from the serving process; gunicorn.conf.py starts it as soon as a worker boots
+            app.before_request(warmer.start)
+
     return app
@@ -1,11 +1,10 @@
 # app/oauth.py
 
 import os
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
 from flask import session
 
 def get_spotify_oauth():
+    from spotipy.oauth2 import SpotifyOAuth
     return SpotifyOAuth(
         client_id=os.getenv('SPOTIFY_CLIENT_ID'),
         client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
@@ -28,4 +27,6 @@ def get_spotify_user_client():
 
     access_token = token_info['access_token']
 
+    import spotipy
+
     return spotipy.Spotify(auth=access_token)
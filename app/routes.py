@@ -1,5 +1,4 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session, jsonify
-from spotipy.oauth2 import SpotifyOAuth
 from .track_selection import fetch_tracks
 from .dj_set_generator import start_set, add_track, suggest_next_tracks
 import os
@@ -18,6 +17,7 @@ def auth():
 
 @bp.route('/login')
 def login():
+    from spotipy.oauth2 import SpotifyOAuth
     sp_oauth = SpotifyOAuth(
         client_id=os.getenv('SPOTIFY_CLIENT_ID'),
         client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
@@ -29,6 +29,7 @@ def login():
 
 @bp.route('/callback')
 def callback():
+    from spotipy.oauth2 import SpotifyOAuth
     sp_oauth = SpotifyOAuth(
         client_id=os.getenv('SPOTIFY_CLIENT_ID'),
         client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
@@ -1,8 +1,7 @@
 import sqlite3
 import os
+import threading
 from typing import List, Dict, Optional
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
 from dotenv import load_dotenv
 import uuid
 
@@ -10,25 +9,46 @@ import uuid
 env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path=env_path)
 
-# Check for required environment variables
-client_id = os.getenv("SPOTIFY_CLIENT_ID")
-client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
-if not client_id or not client_secret:
-    raise EnvironmentError(
-        f"Missing Spotify credentials. Ensure SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET are set in {env_path}."
-    )
+# Spotify client and database are set up lazily on first use so that
+# importing this module stays cheap and has no network or disk side effects.
+_sp = None
+_sp_lock = threading.Lock()
 
-# Initialize Spotify client
-try:
-    sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-        client_id=client_id,
-        client_secret=client_secret
-    ))
-except spotipy.exceptions.SpotifyOauthError as e:
-    raise EnvironmentError(f"Failed to initialize Spotify client: {str(e)}")
+def get_spotify_client():
+    """Return the shared client-credentials Spotify client, creating it on first use."""
+    global _sp
+    if _sp is not None:
+        return _sp
+    with _sp_lock:
+        if _sp is None:
+            # Check for required environment variables
+            client_id = os.getenv("SPOTIFY_CLIENT_ID")
+            client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+            if not client_id or not client_secret:
+                raise EnvironmentError(
+                    f"Missing Spotify credentials. Ensure SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET are set in {env_path}."
+                )
+            import spotipy
+            from spotipy.oauth2 import SpotifyClientCredentials
+            try:
+                _sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
+                    client_id=client_id,
+                    client_secret=client_secret
+                ))
+            except spotipy.exceptions.SpotifyOauthError as e:
+                raise EnvironmentError(f"Failed to initialize Spotify client: {str(e)}")
+    return _sp
+
+def __getattr__(name):
+    # Keep `from app.set import sp` working without creating the client at import time
+    if name == 'sp':
+        return get_spotify_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Database setup
 DB_PATH = os.getenv("DJ_DB_PATH", "dj_assistant.db")
+_db_ready = False
+_db_lock = threading.Lock()
 
 def init_db():
     """Initialize the database with required tables."""
@@ -53,16 +73,27 @@ def init_db():
                 FOREIGN KEY (set_id) REFERENCES dj_sets (set_id)
             )
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tracks_set_id ON tracks (set_id, id)
+        """)
         conn.commit()
 
-# Initialize database on module load
-init_db()
+def _ensure_db() -> None:
+    """Run init_db() once per process, on first database access."""
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_lock:
+        if not _db_ready:
+            init_db()
+            _db_ready = True
 
 def start_set(user_id: str, genre: str, country: str, set_name: str) -> str:
     """Create a new DJ set in the database and return set_id."""
     if not all([user_id, set_name]):
         raise ValueError("Missing user_id or set_name")
     set_id = str(uuid.uuid4())
+    _ensure_db()
     try:
         with sqlite3.connect(DB_PATH) as conn:
             cursor = conn.cursor()
@@ -87,6 +118,7 @@ def add_track_to_set(user_id: str, set_id: str, track: Dict) -> None:
     artist = track.get('artists', [{}])[0].get('name')
     if not all([track_id, track_name, artist]):
         raise ValueError("Invalid track data")
+    _ensure_db()
     try:
         with sqlite3.connect(DB_PATH) as conn:
             cursor = conn.cursor()
@@ -114,6 +146,7 @@ def remove_track_from_set(user_id: str, set_id: str, track_id: str) -> None:
     """Remove a specific track from a DJ set in the database."""
     if not all([user_id, set_id, track_id]):
         raise ValueError("Missing user_id, set_id, or track_id")
+    _ensure_db()
     try:
         with sqlite3.connect(DB_PATH) as conn:
             cursor = conn.cursor()
@@ -142,6 +175,7 @@ def get_set_tracks(set_id: str) -> List[Dict]:
     """Retrieve the tracks in a DJ set from the database."""
     if not set_id:
         raise ValueError("Missing set_id")
+    _ensure_db()
     try:
         with sqlite3.connect(DB_PATH) as conn:
             conn.row_factory = sqlite3.Row
@@ -161,6 +195,7 @@ def update_set_name(set_id: str, set_name: str) -> None:
     """Update the name of an existing DJ set in the database."""
     if not all([set_id, set_name]):
         raise ValueError("Missing set_id or set_name")
+    _ensure_db()
     try:
         with sqlite3.connect(DB_PATH) as conn:
             cursor = conn.cursor()
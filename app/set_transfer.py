@@ -0,0 +1,397 @@
+import csv
+import json
+import sqlite3
+import uuid
+from itertools import islice
+
+# Flat row layout shared by every store and format: one row per track,
+# plus one row with empty track fields for a set that has no tracks.
+FIELDS = [
+    'set_id', 'user_id', 'set_name', 'genre', 'country',
+    'sl_no', 'track_id', 'title', 'artist', 'image_url', 'key', 'bpm',
+]
+FORMATS = ('jsonl', 'csv', 'm3u')
+STORES = ('sqlite', 'postgres')
+BATCH_SIZE = 5000
+
+# ----------------------------------------
+# Read Rows From a Store (streaming)
+# ----------------------------------------
+def _scope_clause(alias, placeholder, set_id, user_id):
+    conditions, params = [], []
+    if set_id:
+        conditions.append(f"{alias}set_id = {placeholder}")
+        params.append(set_id)
+    if user_id:
+        conditions.append(f"{alias}user_id = {placeholder}")
+        params.append(user_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return where, params
+
+def iter_sqlite_rows(conn, set_id=None, user_id=None):
+    """Yield export rows from the SQLite store in app/set.py, ordered by set and insertion."""
+    where, params = _scope_clause('s.', '?', set_id, user_id)
+    cursor = conn.execute(
+        f"""
+        SELECT s.set_id, s.user_id, s.set_name, s.genre, s.country,
+               t.track_id, t.track_name, t.artist
+        FROM dj_sets s LEFT JOIN tracks t ON t.set_id = s.set_id
+        {where}
+        ORDER BY s.set_id, t.id
+        """,
+        params
+    )
+    # sqlite3 cursors step through the result set lazily, so memory stays flat
+    current_set, sl_no = None, 0
+    for set_id_, user_id_, set_name, genre, country, track_id, title, artist in cursor:
+        if set_id_ != current_set:
+            current_set, sl_no = set_id_, 0
+        if track_id is not None:
+            sl_no += 1
+        yield {
+            'set_id': set_id_, 'user_id': user_id_, 'set_name': set_name,
+            'genre': genre, 'country': country,
+            'sl_no': sl_no if track_id is not None else None,
+            'track_id': track_id, 'title': title, 'artist': artist,
+            'image_url': None, 'key': None, 'bpm': None,
+        }
+
+def iter_postgres_rows(conn, set_id=None, user_id=None, batch_size=BATCH_SIZE):
+    """Yield export rows from the Postgres dj_sets table through a server-side cursor."""
+    where, params = _scope_clause('', '%s', set_id, user_id)
+    # A named cursor keeps the result set on the server and fetches batch_size rows at a time
+    with conn.cursor(name=f"dj_sets_export_{uuid.uuid4().hex}") as cursor:
+        cursor.itersize = batch_size
+        cursor.execute(
+            f"""
+            SELECT set_id::text, user_id, set_name, genre, country, sl_no,
+                   track_id, title, artist_name, image_url, key, bpm
+            FROM dj_sets
+            {where}
+            ORDER BY set_id, sl_no
+            """,
+            params
+        )
+        for row in cursor:
+            yield dict(zip(FIELDS, row))
+
+# ----------------------------------------
+# Write Rows in Each Format (constant memory)
+# ----------------------------------------
+def write_jsonl(rows, fp):
+    count = 0
+    for row in rows:
+        fp.write(json.dumps(row, ensure_ascii=False))
+        fp.write('\n')
+        count += 1
+    return count
+
+def write_csv(rows, fp):
+    writer = csv.DictWriter(fp, fieldnames=FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def _m3u_text(value):
+    # A line break inside a name would start a new playlist entry
+    return str(value).replace('\r', ' ').replace('\n', ' ')
+
+def write_m3u(rows, fp):
+    """Write one set as an extended M3U playlist. An M3U file holds a single playlist."""
+    fp.write('#EXTM3U\n')
+    count, current_set = 0, None
+    for row in rows:
+        if current_set is None:
+            current_set = row['set_id']
+            fp.write(f"#PLAYLIST:{_m3u_text(row['set_name'])}\n")
+        elif row['set_id'] != current_set:
+            raise ValueError("M3U export holds one set; export each set to its own file")
+        if not row['track_id']:
+            continue
+        fp.write(f"#EXTINF:-1,{_m3u_text(row['artist'])} - {_m3u_text(row['title'])}\n")
+        fp.write(f"spotify:track:{row['track_id']}\n")
+        count += 1
+    return count
+
+_WRITERS = {'jsonl': write_jsonl, 'csv': write_csv, 'm3u': write_m3u}
+
+# ----------------------------------------
+# Parse and Validate Rows From a File (streaming)
+# ----------------------------------------
+# An import file must be laid out the way export_sets() writes it: rows sorted by
+# set_id, each set's rows together, sl_no strictly increasing from 1 within a set,
+# and a set without tracks written as a single row with no sl_no. Only the current
+# set is remembered while checking this, so memory does not grow with the file.
+SET_FIELDS = ['user_id', 'set_name', 'genre', 'country']
+STRING_FIELDS = ['set_id', 'user_id', 'set_name', 'genre', 'country', 'track_id', 'title', 'artist', 'image_url', 'key']
+INT_FIELDS = ['sl_no', 'bpm']
+
+def _optional_int(value, field, line_no):
+    if value is None:
+        return None
+    # CSV gives every value as a string
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise ValueError(f"Line {line_no}: {field} must be an integer")
+
+def validate_row(raw, line_no):
+    """Normalize an imported row to FIELDS, raising ValueError on bad data."""
+    row = {field: (raw.get(field) if raw.get(field) != '' else None) for field in FIELDS}
+    for field in STRING_FIELDS:
+        if row[field] is not None and not isinstance(row[field], str):
+            raise ValueError(f"Line {line_no}: {field} must be a string")
+    for field in INT_FIELDS:
+        row[field] = _optional_int(row[field], field, line_no)
+    if not all([row['set_id'], row['user_id'], row['set_name']]):
+        raise ValueError(f"Line {line_no}: missing set_id, user_id, or set_name")
+    try:
+        row['set_id'] = str(uuid.UUID(row['set_id']))
+    except ValueError:
+        raise ValueError(f"Line {line_no}: set_id is not a valid UUID")
+    if row['track_id'] and not all([row['title'], row['artist']]):
+        raise ValueError(f"Line {line_no}: invalid track data")
+    if bool(row['track_id']) != (row['sl_no'] is not None):
+        raise ValueError(f"Line {line_no}: sl_no must be set for track rows and empty otherwise")
+    if row['sl_no'] is not None and row['sl_no'] < 1:
+        raise ValueError(f"Line {line_no}: sl_no must be 1 or more")
+    return row
+
+def _validated(records):
+    """Validate (line_no, raw) records and check the set layout described above."""
+    current, last_sl_no = None, None
+    for line_no, raw in records:
+        row = validate_row(raw, line_no)
+        if current is None or row['set_id'] != current['set_id']:
+            if current is not None and row['set_id'] < current['set_id']:
+                raise ValueError(f"Line {line_no}: rows must be sorted by set_id with each set's rows together")
+            current = row
+        elif any(row[field] != current[field] for field in SET_FIELDS):
+            raise ValueError(f"Line {line_no}: {', '.join(SET_FIELDS)} must match the set's first row")
+        elif last_sl_no is None or row['sl_no'] is None or row['sl_no'] <= last_sl_no:
+            raise ValueError(f"Line {line_no}: sl_no must increase within a set, and a set without tracks has one row")
+        last_sl_no = row['sl_no']
+        yield row
+
+def _jsonl_records(fp):
+    for line_no, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_no}: invalid JSON ({e.msg})")
+        if not isinstance(raw, dict):
+            raise ValueError(f"Line {line_no}: expected a JSON object")
+        yield line_no, raw
+
+def read_jsonl(fp):
+    return _validated(_jsonl_records(fp))
+
+def read_csv(fp):
+    # Header is line 1, so data rows start at line 2
+    return _validated(enumerate(csv.DictReader(fp), 2))
+
+_READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+# ----------------------------------------
+# Load Rows Into a Store (batched transactions)
+# ----------------------------------------
+# Both stores follow the same rules. The file is authoritative for every set it
+# contains: the first time an import reaches a set, the set's metadata is taken from
+# the file and its existing tracks are removed, then the file's tracks are loaded.
+# A set that already belongs to a different user raises ValueError. Re-running an
+# import, including after one that failed partway through, leaves each set as the
+# file describes it. Rows must come from read_jsonl() or read_csv().
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def load_sqlite_rows(conn, rows, batch_size=BATCH_SIZE):
+    """
+    Load rows into the SQLite store, committing once per batch.
+    SQLite keeps track order rather than sl_no, so exports renumber each set from 1.
+    Returns the number of tracks inserted.
+    """
+    current_set = None
+    inserted = 0
+    for batch in _batches(rows, batch_size):
+        track_rows = []
+        with conn:
+            for row in batch:
+                if row['set_id'] != current_set:
+                    current_set = row['set_id']
+                    _reset_sqlite_set(conn, row)
+                if row['track_id']:
+                    track_rows.append((row['set_id'], row['track_id'], row['title'], row['artist']))
+            conn.executemany(
+                """
+                INSERT INTO tracks (set_id, track_id, track_name, artist)
+                VALUES (?, ?, ?, ?)
+                """,
+                track_rows
+            )
+        inserted += len(track_rows)
+    return inserted
+
+def _reset_sqlite_set(conn, row):
+    """Create the set, or update an existing set of the same user and clear its tracks."""
+    owner = conn.execute(
+        "SELECT user_id FROM dj_sets WHERE set_id = ?", (row['set_id'],)
+    ).fetchone()
+    if owner is None:
+        conn.execute(
+            """
+            INSERT INTO dj_sets (set_id, user_id, genre, country, set_name)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (row['set_id'], row['user_id'], row['genre'], row['country'], row['set_name'])
+        )
+        return
+    if owner[0] != row['user_id']:
+        raise ValueError(f"Set {row['set_id']} belongs to another user")
+    conn.execute(
+        "UPDATE dj_sets SET genre = ?, country = ?, set_name = ? WHERE set_id = ?",
+        (row['genre'], row['country'], row['set_name'], row['set_id'])
+    )
+    conn.execute("DELETE FROM tracks WHERE set_id = ?", (row['set_id'],))
+
+def load_postgres_rows(conn, rows, batch_size=BATCH_SIZE):
+    """
+    Load rows into the Postgres dj_sets table, committing once per batch.
+    On error the current batch is left uncommitted; roll the connection back.
+    Returns the number of rows inserted.
+    """
+    from psycopg2.extras import execute_values
+    current_set = None
+    inserted = 0
+    for batch in _batches(rows, batch_size):
+        with conn.cursor() as cursor:
+            # dj_sets.user_id references users, so make sure every owner exists first
+            execute_values(
+                cursor,
+                "INSERT INTO users (user_id, username) VALUES %s ON CONFLICT (user_id) DO NOTHING",
+                list({(row['user_id'], row['user_id']) for row in batch}),
+                page_size=batch_size
+            )
+            for row in batch:
+                if row['set_id'] != current_set:
+                    current_set = row['set_id']
+                    _reset_postgres_set(cursor, row)
+            execute_values(
+                cursor,
+                """
+                INSERT INTO dj_sets (set_id, user_id, set_name, genre, country, sl_no,
+                                     track_id, title, artist_name, image_url, key, bpm)
+                VALUES %s
+                """,
+                [tuple(row[field] for field in FIELDS) for row in batch],
+                page_size=batch_size
+            )
+            inserted += cursor.rowcount
+        conn.commit()
+    return inserted
+
+def _reset_postgres_set(cursor, row):
+    """Remove the rows of an existing set of the same user so the file can replace them."""
+    cursor.execute("SELECT DISTINCT user_id FROM dj_sets WHERE set_id = %s", (row['set_id'],))
+    if any(owner != row['user_id'] for (owner,) in cursor.fetchall()):
+        raise ValueError(f"Set {row['set_id']} belongs to another user")
+    cursor.execute("DELETE FROM dj_sets WHERE set_id = %s", (row['set_id'],))
+
+# ----------------------------------------
+# Entry Points
+# ----------------------------------------
+def _connect(store):
+    """Return (conn, release) for the requested store."""
+    if store == 'sqlite':
+        from .set import DB_PATH, _ensure_db
+        _ensure_db()
+        conn = sqlite3.connect(DB_PATH)
+        return conn, conn.close
+    if store == 'postgres':
+        from .db import db
+        conn = db.get_db()
+        return conn, lambda: db.put_db(conn)
+    raise ValueError(f"Unknown store: {store}")
+
+def export_sets(fp, fmt='jsonl', store='sqlite', set_id=None, user_id=None, batch_size=BATCH_SIZE):
+    """
+    Stream DJ sets to an open text file. Scope is one set, one user's sets, or all sets;
+    M3U holds a single playlist, so it needs set_id.
+    Returns the number of rows (M3U: tracks) written.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == 'm3u' and not set_id:
+        raise ValueError("M3U export needs a set_id")
+    conn, release = _connect(store)
+    rows = None
+    try:
+        if store == 'sqlite':
+            rows = iter_sqlite_rows(conn, set_id=set_id, user_id=user_id)
+        else:
+            rows = iter_postgres_rows(conn, set_id=set_id, user_id=user_id, batch_size=batch_size)
+        return _WRITERS[fmt](rows, fp)
+    finally:
+        # Close the server-side cursor now, before the connection goes back to the pool
+        if rows is not None:
+            rows.close()
+        if store == 'postgres':
+            conn.rollback()  # end the read transaction held by the named cursor
+        release()
+
+def import_sets(fp, fmt='jsonl', store='sqlite', batch_size=BATCH_SIZE):
+    """Validate and load DJ sets from an open JSON Lines or CSV file. Returns rows inserted."""
+    if fmt not in _READERS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    conn, release = _connect(store)
+    try:
+        rows = _READERS[fmt](fp)
+        if store == 'sqlite':
+            return load_sqlite_rows(conn, rows, batch_size=batch_size)
+        return load_postgres_rows(conn, rows, batch_size=batch_size)
+    except Exception:
+        if store == 'postgres':
+            conn.rollback()
+        raise
+    finally:
+        release()
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Bulk export/import of DJ sets")
+    parser.add_argument('action', choices=['export', 'import'])
+    parser.add_argument('path', help="File to write or read, '-' for stdout/stdin")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl')
+    parser.add_argument('--store', choices=STORES, default='sqlite')
+    parser.add_argument('--set-id', help="Required for --format m3u")
+    parser.add_argument('--user-id')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    mode = 'w' if args.action == 'export' else 'r'
+    if args.path == '-':
+        fp = sys.stdout if mode == 'w' else sys.stdin
+    else:
+        fp = open(args.path, mode, newline='', encoding='utf-8')
+    try:
+        if args.action == 'export':
+            count = export_sets(fp, args.format, args.store, args.set_id, args.user_id, args.batch_size)
+            print(f"Exported {count} rows", file=sys.stderr)
+        else:
+            count = import_sets(fp, args.format, args.store, args.batch_size)
+            print(f"Imported {count} rows", file=sys.stderr)
+    finally:
+        if fp not in (sys.stdout, sys.stdin):
+            fp.close()
@@ -1,12 +1,42 @@
 import os
 import time
+import threading
 import requests
 from .oauth import get_spotify_user_client
 
+country_to_market = {
+    'united states': 'US',
+    'germany': 'DE',
+    'united kingdom': 'GB',
+    'france': 'FR',
+    'canada': 'CA',
+    'australia': 'AU',
+    'brazil': 'BR',
+    'india': 'IN',
+    'japan': 'JP',
+    'mexico': 'MX',
+}
+
+# Trending results per (genre, market): (fetched_at, tracks), oldest write first.
+# Genres come from user input, so the cache is capped and expired entries are dropped on write.
+TRENDING_CACHE_TTL = int(os.getenv('TRENDING_CACHE_TTL', '900'))
+TRENDING_CACHE_MAX_ENTRIES = int(os.getenv('TRENDING_CACHE_MAX_ENTRIES', '512'))
+_trending_cache = {}
+_trending_lock = threading.Lock()
+
+# Client-credentials token reused until shortly before it expires
+_access_token = None
+_access_token_expires_at = 0.0
+_token_lock = threading.Lock()
+
 # ----------------------------------------
 # Get Access Token for Client Credentials
 # ----------------------------------------
 def get_access_token():
+    global _access_token, _access_token_expires_at
+    with _token_lock:
+        if _access_token and time.time() < _access_token_expires_at:
+            return _access_token
     try:
         client_id = os.getenv('SPOTIFY_CLIENT_ID')
         client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
@@ -17,7 +47,12 @@ def get_access_token():
             'client_secret': client_secret,
         })
         auth_response.raise_for_status()
-        return auth_response.json()['access_token']
+        payload = auth_response.json()
+        with _token_lock:
+            _access_token = payload['access_token']
+            # Refresh a minute early so in-flight requests never use a stale token
+            _access_token_expires_at = time.time() + payload.get('expires_in', 3600) - 60
+        return payload['access_token']
     except Exception as e:
         print(f"Error getting access token: {e}")
         return None
@@ -25,22 +60,36 @@ def get_access_token():
 # ----------------------------------------
 # Fetch Trending Tracks by Genre & Country (with cover image)
 # ----------------------------------------
-def fetch_trending_tracks(genre, country='United States'):
-    country_to_market = {
-        'united states': 'US',
-        'germany': 'DE',
-        'united kingdom': 'GB',
-        'france': 'FR',
-        'canada': 'CA',
-        'australia': 'AU',
-        'brazil': 'BR',
-        'india': 'IN',
-        'japan': 'JP',
-        'mexico': 'MX',
-    }
+def fetch_trending_tracks(genre, country='United States', refresh=False):
     market = country_to_market.get(country.lower(), 'US')
     print(f"Using market code: {market} for country: {country}")
 
+    cache_key = (genre.lower(), market)
+    if not refresh:
+        with _trending_lock:
+            cached = _trending_cache.get(cache_key)
+        if cached and time.time() - cached[0] < TRENDING_CACHE_TTL:
+            return list(cached[1])
+
+    tracks = _search_trending_tracks(genre, market)
+    if tracks:
+        _store_trending(cache_key, tracks)
+    return list(tracks)
+
+def _store_trending(cache_key, tracks):
+    now = time.time()
+    with _trending_lock:
+        # Re-insert so the dict stays ordered by write time
+        _trending_cache.pop(cache_key, None)
+        _trending_cache[cache_key] = (now, tracks)
+        for key, (fetched_at, _) in list(_trending_cache.items()):
+            if now - fetched_at < TRENDING_CACHE_TTL:
+                break
+            del _trending_cache[key]
+        while len(_trending_cache) > TRENDING_CACHE_MAX_ENTRIES:
+            del _trending_cache[next(iter(_trending_cache))]
+
+def _search_trending_tracks(genre, market):
     tracks = []
     try:
         access_token = get_access_token()
@@ -0,0 +1,56 @@
+import os
+import threading
+from .track_selection import country_to_market, fetch_trending_tracks
+
+# ----------------------------------------
+# Pre-fill the trending cache so new workers serve /tracks from warm data
+# ----------------------------------------
+def warm_trending_cache(genres, countries=None, refresh=True):
+    countries = countries or list(country_to_market)
+    warmed = 0
+    for genre in genres:
+        for country in countries:
+            if fetch_trending_tracks(genre, country, refresh=refresh):
+                warmed += 1
+    print(f"Warmed trending cache for {warmed} genre/market pairs")
+    return warmed
+
+class CacheWarmer:
+    """
+    Keeps the trending cache warm from a daemon thread in the serving process.
+
+    start() is safe to call on every request: it starts one thread per process,
+    so a warmer never runs in a process that only forks workers (a gunicorn
+    master, the debug reloader's parent) and every worker gets its own.
+    """
+
+    def __init__(self, genres, interval=600, countries=None):
+        if interval <= 0:
+            raise ValueError("Warm-up interval must be a positive number of seconds")
+        self.genres = genres
+        self.interval = interval
+        self.countries = countries
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            threading.Thread(target=self._run, args=(self._stop,), name='trending-cache-warmer', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                warm_trending_cache(self.genres, self.countries)
+            except Exception as e:
+                print(f"Error warming trending cache: {e}")
+            stop.wait(self.interval)
@@ -0,0 +1,8 @@
+# Gunicorn picks this file up from the working directory.
+
+def post_worker_init(worker):
+    # Start the trending cache warmer in each worker as soon as it has loaded the app,
+    # instead of waiting for its first request (works with and without --preload)
+    warmer = getattr(worker.wsgi, 'extensions', {}).get('trending_cache_warmer')
+    if warmer:
+        warmer.start()
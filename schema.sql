@@ -3,8 +3,12 @@ CREATE TABLE users (
     username VARCHAR(255) NOT NULL
 );
 
+-- One row per track, keyed by (set_id, sl_no); a set with no tracks has a single row with NULL sl_no.
+-- Migrating a database created with set_id as PRIMARY KEY:
+--   ALTER TABLE dj_sets DROP CONSTRAINT dj_sets_pkey;
+--   ALTER TABLE dj_sets ALTER COLUMN set_id SET NOT NULL;
 CREATE TABLE dj_sets (
-    set_id UUID PRIMARY KEY,
+    set_id UUID NOT NULL,
     user_id VARCHAR(255) REFERENCES users(user_id),
     set_name VARCHAR(255) NOT NULL,
     genre VARCHAR(100),
@@ -0,0 +1,109 @@
+"""
+Benchmark bulk export and re-import of DJ sets against the SQLite store.
+
+Generates a database with --rows tracks, exports it as JSON Lines and CSV, exports
+every set to its own M3U playlist, imports the
+JSON Lines and CSV exports into a fresh database, then re-runs each import and
+checks that the result still matches the source.
+
+    python scripts/bench_set_transfer.py [--rows 1000000] [--tracks-per-set 50] [--batch-size 5000]
+"""
+import argparse
+import hashlib
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import set as set_store
+from app.set_transfer import iter_sqlite_rows, load_sqlite_rows, read_csv, read_jsonl, write_csv, write_jsonl, write_m3u
+
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+def create_db(path):
+    set_store.DB_PATH = path
+    set_store.init_db()
+    return sqlite3.connect(path)
+
+def generate(conn, rows, tracks_per_set):
+    with conn:
+        for n in range(0, rows, tracks_per_set):
+            set_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO dj_sets (set_id, user_id, genre, country, set_name) VALUES (?, ?, ?, ?, ?)",
+                (set_id, f"user{n // tracks_per_set % 1000}", 'techno', 'Germany', f"Set {n // tracks_per_set}")
+            )
+            conn.executemany(
+                "INSERT INTO tracks (set_id, track_id, track_name, artist) VALUES (?, ?, ?, ?)",
+                [(set_id, uuid.uuid4().hex[:22], f"Track {i}, \"mix\"", 'Artist') for i in range(min(tracks_per_set, rows - n))]
+            )
+
+def digest(conn):
+    h = hashlib.sha256()
+    for row in iter_sqlite_rows(conn):
+        h.update(repr(sorted(row.items())).encode())
+    return h.hexdigest()
+
+def timed(label, count_fn):
+    start = time.perf_counter()
+    count = count_fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<21} {count:>10,} rows {elapsed:8.2f}s {count / elapsed:>12,.0f} rows/s")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--tracks-per-set', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = create_db(os.path.join(tmp, 'source.db'))
+        generate(source, args.rows, args.tracks_per_set)
+        expected = digest(source)
+
+        for fmt in READERS:
+            def export(fmt=fmt):
+                with open(os.path.join(tmp, f"export.{fmt}"), 'w', newline='', encoding='utf-8') as fp:
+                    return WRITERS[fmt](iter_sqlite_rows(source), fp)
+            timed(f"export {fmt}", export)
+
+        def export_m3u():
+            # An M3U file holds one playlist, so each set gets its own file
+            os.mkdir(os.path.join(tmp, 'm3u'))
+            count = 0
+            for (set_id,) in source.execute("SELECT set_id FROM dj_sets").fetchall():
+                with open(os.path.join(tmp, 'm3u', f"{set_id}.m3u"), 'w', encoding='utf-8') as fp:
+                    count += write_m3u(iter_sqlite_rows(source, set_id=set_id), fp)
+            return count
+        timed("export m3u (per set)", export_m3u)
+
+        ok = True
+        for fmt in READERS:
+            target = create_db(os.path.join(tmp, f"import_{fmt}.db"))
+            for label in (f"import {fmt}", f"re-import {fmt}"):
+                def load(fmt=fmt, target=target):
+                    with open(os.path.join(tmp, f"export.{fmt}"), newline='', encoding='utf-8') as fp:
+                        return load_sqlite_rows(target, READERS[fmt](fp), batch_size=args.batch_size)
+                timed(label, load)
+                if digest(target) != expected:
+                    print(f"MISMATCH after {label}")
+                    ok = False
+            target.close()
+        source.close()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"Peak RSS: {rss / (1024 * 1024 if sys.platform == 'darwin' else 1024):.0f} MB")
+    print("Round trip: OK" if ok else "Round trip: FAILED")
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Check that booting the app stays within the import-time budget.
+
+Runs `import app; app.create_app()` in fresh interpreters and fails if the best
+of several runs exceeds the budget, or if Spotify's client library was loaded
+at boot. create_app() normally loads spotipy on a background thread; the check
+boots with warm_cache=False so that an eager import on the boot path shows up.
+
+    python scripts/check_import_time.py [--budget 0.5] [--runs 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+app.create_app(warm_cache=False)
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'heavy': sorted(m for m in ('spotipy', 'psycopg2', 'app.set', 'app.db') if m in sys.modules),
+}))
+"""
+
+def measure():
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=float(os.getenv('IMPORT_TIME_BUDGET', '0.5')),
+                        help="Maximum boot time in seconds (default 0.5)")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [measure() for _ in range(args.runs)]
+    best = min(s['seconds'] for s in samples)
+    heavy = samples[0]['heavy']
+    print(f"Boot time: best {best:.3f}s of {args.runs} runs (budget {args.budget:.3f}s)")
+
+    failed = False
+    if best > args.budget:
+        print(f"FAIL: boot time {best:.3f}s exceeds budget {args.budget:.3f}s")
+        failed = True
+    if heavy:
+        print(f"FAIL: loaded at boot, should be deferred until first use: {', '.join(heavy)}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Check that bulk import/export of DJ sets follows the same rules on every store.
+
+Always runs against a temporary SQLite store. Pass --pg-dsn (or set
+DJ_TEST_PG_DSN) to also run against Postgres; the check creates a scratch
+schema from schema.sql and drops it afterwards.
+
+    python scripts/check_set_transfer.py [--pg-dsn postgresql://...]
+"""
+import argparse
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from app import set as set_store
+from app.set_transfer import (
+    FIELDS, iter_postgres_rows, iter_sqlite_rows, load_postgres_rows, load_sqlite_rows, read_jsonl, write_m3u,
+)
+
+SET_A, SET_B = sorted(str(uuid.uuid4()) for _ in range(2))
+
+def row(set_id, sl_no=None, track_id=None, user_id='alice', set_name='Warm up', **extra):
+    data = dict.fromkeys(FIELDS)
+    data.update(set_id=set_id, user_id=user_id, set_name=set_name, genre='techno', country='Germany')
+    if sl_no is not None:
+        data.update(sl_no=sl_no, track_id=track_id, title=f"Title {track_id}", artist='Artist',
+                    image_url=f"https://img/{track_id}", key='Am', bpm=128)
+    data.update(extra)
+    return data
+
+def jsonl(rows):
+    return '\n'.join(json.dumps(r) for r in rows) + '\n'
+
+# ----------------------------------------
+# Store Adapters
+# ----------------------------------------
+class SqliteStore:
+    name = 'sqlite'
+
+    def __init__(self, tmp):
+        set_store.DB_PATH = os.path.join(tmp, 'check.db')
+        set_store.init_db()
+        self.conn = sqlite3.connect(set_store.DB_PATH)
+
+    def load(self, text, batch_size=1000):
+        return load_sqlite_rows(self.conn, read_jsonl(io.StringIO(text)), batch_size=batch_size)
+
+    def dump(self):
+        return list(iter_sqlite_rows(self.conn))
+
+    def expected(self, rows):
+        # SQLite stores neither cover art, key nor BPM, and numbers tracks from 1
+        result, positions = [], {}
+        for r in rows:
+            r = dict(r, image_url=None, key=None, bpm=None)
+            if r['track_id']:
+                positions[r['set_id']] = positions.get(r['set_id'], 0) + 1
+                r['sl_no'] = positions[r['set_id']]
+            result.append(r)
+        return result
+
+    def close(self):
+        self.conn.close()
+
+class PostgresStore:
+    name = 'postgres'
+
+    def __init__(self, dsn):
+        import psycopg2
+        self.conn = psycopg2.connect(dsn)
+        self.schema = f"set_transfer_check_{uuid.uuid4().hex[:12]}"
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA {self.schema}")
+            cursor.execute(f"SET search_path TO {self.schema}")
+            with open(os.path.join(ROOT, 'schema.sql')) as fp:
+                cursor.execute(fp.read())
+        self.conn.commit()
+
+    def load(self, text, batch_size=1000):
+        try:
+            return load_postgres_rows(self.conn, read_jsonl(io.StringIO(text)), batch_size=batch_size)
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def dump(self):
+        rows = list(iter_postgres_rows(self.conn))
+        self.conn.rollback()
+        return rows
+
+    def expected(self, rows):
+        return [dict(r) for r in rows]
+
+    def close(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA {self.schema} CASCADE")
+        self.conn.commit()
+        self.conn.close()
+
+# ----------------------------------------
+# Scenarios
+# ----------------------------------------
+def check_round_trip(store):
+    rows = [row(SET_A, 1, 'a1'), row(SET_A, 2, 'a2'), row(SET_A, 3, 'a3'), row(SET_B, set_name='Empty')]
+    store.load(jsonl(rows))
+    assert store.dump() == store.expected(rows), "multi-track sets and empty sets round-trip"
+
+def check_file_is_authoritative(store):
+    rows = [row(SET_A, 2, 'b', set_name='Renamed', genre='house'), row(SET_A, 5, 'a', set_name='Renamed', genre='house'),
+            row(SET_B, 1, 'c', set_name='Empty')]
+    store.load(jsonl(rows))
+    assert store.dump() == store.expected(rows), "re-import replaces metadata, order and tracks"
+
+def check_resume_after_failure(store):
+    rows = [row(SET_A, n, f"t{n}") for n in range(1, 5)]
+    bad = rows[:3] + [dict(rows[3], set_name=None)]
+    try:
+        store.load(jsonl(bad), batch_size=2)
+        raise AssertionError("bad line should fail")
+    except ValueError:
+        pass
+    store.load(jsonl(rows), batch_size=2)
+    assert [r['track_id'] for r in store.dump() if r['set_id'] == SET_A] == ['t1', 't2', 't3', 't4'], \
+        "re-running after a partial import restores the whole set"
+
+def check_other_owner_rejected(store):
+    before = store.dump()
+    try:
+        store.load(jsonl([row(SET_A, 1, 'x', user_id='mallory')]))
+        raise AssertionError("a set owned by another user must not be overwritten")
+    except ValueError:
+        pass
+    assert store.dump() == before, "rejected import leaves the store unchanged"
+
+def check_invalid_rows_rejected(store):
+    cases = {
+        'sl_no decreasing': [row(SET_A, 2, 'a'), row(SET_A, 1, 'b')],
+        'duplicate sl_no': [row(SET_A, 1, 'a'), row(SET_A, 1, 'b')],
+        'sets out of order': [row(SET_B, 1, 'a'), row(SET_A, 1, 'b')],
+        'set split in two': [row(SET_A, 1, 'a'), row(SET_B, 1, 'b'), row(SET_A, 2, 'c')],
+        'metadata differs within set': [row(SET_A, 1, 'a'), row(SET_A, 2, 'b', set_name='Other')],
+        'user_id not a string': [row(SET_A, 1, 'a', user_id=['alice'])],
+        'fractional sl_no': [row(SET_A, 1.5, 'a')],
+        'boolean bpm': [row(SET_A, 1, 'a', bpm=True)],
+        'sl_no below 1': [row(SET_A, 0, 'a')],
+    }
+    before = store.dump()
+    for name, rows in cases.items():
+        try:
+            store.load(jsonl(rows))
+            raise AssertionError(f"{name} should be rejected")
+        except ValueError as e:
+            assert str(e).startswith('Line '), f"{name}: error names the line ({e})"
+    assert store.dump() == before, "rejected files leave the store unchanged"
+
+def check_m3u_single_set():
+    out = io.StringIO()
+    write_m3u([row(SET_A, 1, 'a', title='Line\nbreak')], out)
+    assert out.getvalue().count('\n') == 4, "line breaks in names do not split entries"
+    try:
+        write_m3u([row(SET_A, 1, 'a'), row(SET_B, 1, 'b')], io.StringIO())
+        raise AssertionError("M3U must hold one set")
+    except ValueError:
+        pass
+
+SCENARIOS = [check_round_trip, check_file_is_authoritative, check_resume_after_failure,
+             check_other_owner_rejected, check_invalid_rows_rejected]
+
+def run(store):
+    failed = 0
+    for scenario in SCENARIOS:
+        try:
+            scenario(store)
+            print(f"ok    {store.name:<9} {scenario.__name__}")
+        except AssertionError as e:
+            print(f"FAIL  {store.name:<9} {scenario.__name__}: {e}")
+            failed += 1
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pg-dsn', default=os.getenv('DJ_TEST_PG_DSN'))
+    args = parser.parse_args()
+
+    failed = 0
+    try:
+        check_m3u_single_set()
+        print("ok    -         check_m3u_single_set")
+    except AssertionError as e:
+        print(f"FAIL  -         check_m3u_single_set: {e}")
+        failed += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = [lambda: SqliteStore(tmp)]
+        if args.pg_dsn:
+            stores.append(lambda: PostgresStore(args.pg_dsn))
+        else:
+            print("skip  postgres  (no --pg-dsn or DJ_TEST_PG_DSN)")
+        for make_store in stores:
+            store = make_store()
+            try:
+                failed += run(store)
+            finally:
+                store.close()
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())